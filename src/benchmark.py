@@ -0,0 +1,286 @@
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+import numpy as np
+from typing import Callable
+from contextlib import redirect_stdout
+from bisection import bisection
+from newton import newton
+from hardening import EPMaterial
+from stats import SolverStats
+
+def bench_bisection_scalar(scale: float) -> Callable:
+    """Repeatedly finds a zero of a quintic with the bisection method.
+
+    Args:
+        scale: Multiplier on the number of repetitions.
+
+    Returns:
+        Function run(stats) that runs the workload, passing stats to every solver call.
+    """
+    def f(x):
+        return x**5 - x**4 - 2*x**3 - x**2 + x + 1
+    N = max(1, int(200*scale))
+    def run(stats):
+        for i in range(N):
+            bisection(f, -2, 3, tol=1e-12, stats=stats)
+    return run
+
+def bench_bisection_sweep(scale: float) -> Callable:
+    """Finds the cube roots of a sweep of numbers with the bisection method, one scalar solve per number.
+
+    Args:
+        scale: Multiplier on the number of solves.
+
+    Returns:
+        Function run(stats) that runs the workload, passing stats to every solver call.
+    """
+    c = np.linspace(1, 100, max(1, int(1000*scale)))
+    def run(stats):
+        for ci in c:
+            bisection(lambda x: x**3 - ci, 0, 5, tol=1e-10, stats=stats)
+    return run
+
+def bench_newton_batched(scale: float) -> Callable:
+    """Finds the cube roots of a batch of numbers at once with Newton's method on a decoupled diagonal system.
+
+    Args:
+        scale: Multiplier on the batch size.
+
+    Returns:
+        Function run(stats) that runs the workload, passing stats to the solver.
+    """
+    c = np.linspace(1, 100, max(1, int(200*scale)))
+    def f(x):
+        return x**3 - c
+    def run(stats):
+        newton(f, np.full(len(c), 3.0), tol=1e-10, stats=stats)
+    return run
+
+def bench_newton_dense(scale: float) -> Callable:
+    """Repeatedly solves a small dense nonlinear system A x + x^3 = b with Newton's method.
+
+    Args:
+        scale: Multiplier on the number of repetitions.
+
+    Returns:
+        Function run(stats) that runs the workload, passing stats to every solver call.
+    """
+    rng = np.random.default_rng(0)
+    A = rng.normal(size=(8, 8)) + 8*np.eye(8)
+    b = rng.normal(size=8)
+    def f(x):
+        return A @ x + x**3 - b
+    N = max(1, int(100*scale))
+    def run(stats):
+        for i in range(N):
+            newton(f, np.ones(8), tol=1e-10, stats=stats)
+    return run
+
+def bench_newton_banded(scale: float) -> Callable:
+    """Solves a large tridiagonal nonlinear system from a finite difference discretization with Newton's method.
+
+    Args:
+        scale: Multiplier on the number of unknowns.
+
+    Returns:
+        Function run(stats) that runs the workload, passing stats to the solver.
+    """
+    N = max(3, int(300*scale))
+    h = 1/(N + 1)
+    def f(x):
+        # -x'' + x^3 = 1 with zero boundary values
+        y = 2*x + h**2*(x**3 - 1)
+        y[1:] -= x[:-1]
+        y[:-1] -= x[1:]
+        return y
+    def run(stats):
+        newton(f, np.ones(N), tol=1e-10, stats=stats)
+    return run
+
+def cyclic_increments(Nsteps: int) -> np.ndarray:
+    """Builds the strain increments of a triangle wave between strains of +/-0.05 with 200 increments per half cycle.
+
+    Args:
+        Nsteps: Number of strain increments.
+
+    Returns:
+        Array of strain increments starting from zero strain.
+    """
+    # The offset of 100 makes the first ramp run from 0 to 0.05
+    return 0.05/100*np.where(((np.arange(Nsteps) + 100) // 200) % 2 == 0, 1, -1)
+
+def bench_hardening_cyclic(scale: float) -> Callable:
+    """Runs a long cyclic strain history through kinematic and isotropic hardening materials.
+
+    Args:
+        scale: Multiplier on the number of strain increments. One million increments at scale 1, split between the materials.
+
+    Returns:
+        Function run(stats) that runs the workload, passing stats to every material.
+    """
+    dstrain = cyclic_increments(max(1, int(500000*scale)))
+    def run(stats):
+        for model in ['k', 'i']:
+            mat = EPMaterial(1000, 100, 't', 10, model, stats=stats)
+            for d in dstrain:
+                mat.update_state(d)
+    return run
+
+class Discard:
+    """Output stream that drops everything written to it. Used for solver printouts so no buffered text adds to the measured memory."""
+
+    def write(self, text):
+        return len(text)
+
+    def flush(self):
+        pass
+
+# Standard workloads run by the benchmark suite. Each builds its inputs from a scale and returns a function run(stats).
+WORKLOADS = {
+    'bisection_scalar': bench_bisection_scalar,
+    'bisection_sweep': bench_bisection_sweep,
+    'newton_batched': bench_newton_batched,
+    'newton_dense': bench_newton_dense,
+    'newton_banded': bench_newton_banded,
+    'hardening_cyclic': bench_hardening_cyclic,
+}
+
+def run_workload(workload: Callable, scale: float = 1.0, repeat: int = 5, mintime: float = 2.0) -> dict:
+    """Measures a single workload.
+
+    The inputs are built once before any measurement. f evaluations are counted in one pass with a SolverStats. Peak memory is measured in a pass under tracemalloc, and wall time in the timed passes, both without statistics so that they measure the uninstrumented code. Printouts from the solvers are discarded.
+
+    Args:
+        workload: Workload function workload(scale) returning run(stats).
+        scale: Multiplier on the size of the workload. Default 1.
+        repeat: Minimum number of timed passes. The fastest one is reported. Default 5, must be positive.
+        mintime: Minimum total duration of the timed passes in seconds. Passes continue past repeat until it is reached. Default 2, must be non-negative.
+
+    Returns:
+        Dictionary with the fastest wall time of one run in seconds, the number of f evaluations and the peak memory in bytes.
+    """
+    if repeat <= 0:
+        raise Exception('Number of repeats must be positive')
+    if mintime < 0:
+        raise Exception('Minimum time must be non-negative')
+
+    run = workload(scale)
+    with redirect_stdout(Discard()):
+        # Counts f evaluations
+        stats = SolverStats()
+        run(stats)
+
+        # Measures the peak memory of the workload alone, since the inputs were allocated before tracing started
+        tracemalloc.start()
+        try:
+            run(None)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        # Takes the fastest of the timed passes to reduce noise. Short workloads get more passes so every workload is sampled for at least mintime.
+        times = []
+        while len(times) < repeat or sum(times) < mintime:
+            t0 = time.perf_counter()
+            run(None)
+            times.append(time.perf_counter() - t0)
+
+    return {'time': min(times), 'nfev': stats.nfev, 'peak_memory': peak}
+
+def run_benchmarks(names: list = None, scale: float = 1.0, repeat: int = 5, mintime: float = 2.0) -> dict:
+    """Runs the benchmark suite.
+
+    Args:
+        names: Names of the workloads to run. Defaults to every workload in WORKLOADS.
+        scale: Multiplier on the size of every workload. Default 1.
+        repeat: Minimum number of timed passes per workload. Default 5.
+        mintime: Minimum total duration of the timed passes per workload in seconds. Default 2.
+
+    Returns:
+        Dictionary with the scale and the results of each workload, in the format stored in a baseline.
+    """
+    if names is None:
+        names = list(WORKLOADS)
+    for name in names:
+        if name not in WORKLOADS:
+            raise Exception('Unknown workload: %s' % name)
+
+    results = {}
+    for name in names:
+        results[name] = run_workload(WORKLOADS[name], scale, repeat, mintime)
+    return {'scale': scale, 'results': results}
+
+def compare(current: dict, baseline: dict, threshold: float = 0.25) -> list:
+    """Compares benchmark results against a baseline.
+
+    Wall time and peak memory regress when they grow by more than the threshold. The number of f evaluations is deterministic and regresses on any increase. Workloads missing from either side are skipped.
+
+    Args:
+        current: Results from run_benchmarks().
+        baseline: Baseline results in the same format.
+        threshold: Allowed relative growth of wall time and peak memory. Default 0.25, must be non-negative.
+
+    Returns:
+        List of messages describing each regression. Empty if there are none.
+    """
+    if threshold < 0:
+        raise Exception('Threshold must be non-negative')
+    if current['scale'] != baseline['scale']:
+        raise Exception('Scale %g does not match the baseline scale %g' % (current['scale'], baseline['scale']))
+
+    regressions = []
+    for name, result in current['results'].items():
+        if name not in baseline['results']:
+            continue
+        base = baseline['results'][name]
+        for key in ['time', 'peak_memory']:
+            if result[key] > base[key]*(1 + threshold):
+                regressions.append('%s: %s grew from %g to %g' % (name, key, base[key], result[key]))
+        if result['nfev'] > base['nfev']:
+            regressions.append('%s: nfev grew from %i to %i' % (name, base['nfev'], result['nfev']))
+    return regressions
+
+def main(argv: list = None) -> int:
+    """Command line entry point. Run with python -m benchmark --help for the options.
+
+    Args:
+        argv: Command line arguments. Defaults to sys.argv.
+
+    Returns:
+        Exit code. 1 if a regression was found, otherwise 0.
+    """
+    parser = argparse.ArgumentParser(description='Benchmarks the solvers and material updates.')
+    parser.add_argument('--save', help='Writes the results to this JSON baseline')
+    parser.add_argument('--compare', help='Compares the results against this JSON baseline')
+    parser.add_argument('--threshold', type=float, default=0.25, help='Allowed relative growth of time and memory (default 0.25)')
+    parser.add_argument('--scale', type=float, default=1.0, help='Multiplier on the workload sizes (default 1)')
+    parser.add_argument('--repeat', type=int, default=5, help='Minimum number of timed passes per workload (default 5)')
+    parser.add_argument('--mintime', type=float, default=2.0, help='Minimum total duration of the timed passes per workload in seconds (default 2)')
+    parser.add_argument('--only', nargs='+', choices=list(WORKLOADS), help='Workloads to run (default all)')
+    args = parser.parse_args(argv)
+
+    current = run_benchmarks(args.only, args.scale, args.repeat, args.mintime)
+    for name, result in current['results'].items():
+        print('%-20s %10.4f s %10i nfev %12i B' % (name, result['time'], result['nfev'], result['peak_memory']))
+
+    if args.save:
+        with open(args.save, 'w') as file:
+            json.dump(current, file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        regressions = compare(current, baseline, args.threshold)
+        for message in regressions:
+            print('Regression in %s' % message)
+        if regressions:
+            return 1
+        print('No regressions against %s' % args.compare)
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
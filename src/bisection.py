@@ -1,7 +1,9 @@
 import numpy as np
 from inspect import signature
+from typing import Callable
+from stats import SolverStats
 
-def bisection(f, a, b, tol=1e-3, N:int=50):
+def bisection(f, a, b, tol=1e-3, N:int=50, stats:SolverStats=None, callback:Callable=None):
     """Finds a zero of f(x) within x ∈ [a, b].
     
     Args:
@@ -10,10 +12,19 @@ def bisection(f, a, b, tol=1e-3, N:int=50):
         b: Upper bound of bisection method. Must satisfy sign(f(a)) != sign(f(b)).
         tol: Convergence tolerance for bisection method. Default 1e-3, must be positive.
         N (int): Maximum number of loops. Default 50, must be positive.
+        stats: Optional SolverStats that is filled in with the evaluation counts, residuals and timings of the call.
+        callback: Optional function callback(i, m, M) called after every iteration with the midpoint m and its value M = f(m).
 
     Returns:
         x0: Zero of function f(x)
     """
+    # Sets up the statistics. f is only wrapped when they were requested to avoid the timing overhead.
+    if stats is None:
+        stats = SolverStats()
+    else:
+        f = stats.wrap(f)
+    stats.start()
+
     validate_input(f, a, b, tol, N)
 
     # Initializes loop
@@ -22,8 +33,10 @@ def bisection(f, a, b, tol=1e-3, N:int=50):
 
     # Checks if a zero is at a or b.
     if A == 0:
+        stats.stop(True)
         return [a], [A]
     if B == 0:
+        stats.stop(True)
         return [b], [B]
     
     # Actual bisection method.
@@ -35,9 +48,14 @@ def bisection(f, a, b, tol=1e-3, N:int=50):
         # Finds midpoint m and its function value M=f(m)
         m += [(a+b)/2]
         M += [f(m[-1])]
+        stats.niter += 1
+        stats.residuals.append(abs(M[-1]))
+        if callback is not None:
+            callback(i, m[-1], M[-1])
         # Checks for convergence
         if abs(M[-1]) <= tol:
             print("Converged after %i iterations" % i)
+            stats.stop(True)
             return m, M
         # Sees if the midpoint should replace a or b
         if np.sign(M[-1]) == np.sign(A):
@@ -49,6 +67,7 @@ def bisection(f, a, b, tol=1e-3, N:int=50):
     
     # Failsafe in case of non-convergence.
     print("Maximum number of iterations reached without converging.")
+    stats.stop(False)
     return m, M
         
             
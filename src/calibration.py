@@ -0,0 +1,242 @@
+import numpy as np
+from numpy import linalg as la
+from typing import Callable
+from hardening import EPMaterial
+
+def replay(params: np.ndarray, strain: np.ndarray, modulustype: str, model: str | Callable) -> np.ndarray:
+    """Replays a strain history for several parameter sets at once.
+
+    Args:
+        params: Array of shape (P, 3) where each row is a parameter set (E, Ep, Y0).
+        strain: Total strain at each measurement, starting from an unstrained material.
+        modulustype: Type of the secondary modulus Ep. See EPMaterial.
+        model: Hardening model. See EPMaterial. Custom models must accept an array state.
+
+    Returns:
+        stress: Array of shape (P, len(strain)) with the stress of each parameter set at each measurement.
+    """
+    params = np.atleast_2d(np.asarray(params, dtype=np.float64))
+    # Copies each column so the hardening models can update the properties in place
+    mat = EPMaterial(params[:, 0].copy(), params[:, 1].copy(), modulustype, params[:, 2].copy(), model)
+    dstrain = np.diff(strain, prepend=0)
+
+    stress = np.zeros((params.shape[0], len(dstrain)))
+    for j in range(len(dstrain)):
+        mat.update_state(dstrain[j])
+        stress[:, j] = mat.stress
+    return stress
+
+# Names of the fitted parameters in the order they are stored
+PARAMETERS = ['E', 'Ep', 'Y0']
+
+def unused_parameters(J: np.ndarray) -> np.ndarray:
+    """Finds the parameters that have no effect on the residual.
+
+    Args:
+        J: Jacobian of the residual with respect to the parameters.
+
+    Returns:
+        Boolean array that is True for every parameter whose Jacobian column is zero.
+    """
+    return la.norm(J, axis=0) == 0
+
+def feasible(p: np.ndarray, modulustype: str) -> bool:
+    """Checks that a parameter set describes a physical material.
+
+    Args:
+        p: Parameters (E, Ep, Y0).
+        modulustype: Type of the secondary modulus. See EPMaterial.
+
+    Returns:
+        True if E, Ep and Y0 are positive and, for a tangent modulus, Ep < E.
+    """
+    if not np.all(np.isfinite(p)) or np.any(p <= 0):
+        return False
+    if modulustype in ['T', 't', 'Tangent', 'tangent']:
+        return p[1] < p[0]
+    return True
+
+class CalibrationResult:
+    """Class holding the outcome of a material calibration.
+
+    Attributes:
+        E: Fitted elastic modulus
+        Ep: Fitted secondary modulus, of the same type as passed to calibrate()
+        Y0: Fitted initial yield strength
+        params: Array of the fitted parameters (E, Ep, Y0)
+        converged: Whether one of the tolerances was reached before maxiter
+        iterations: Number of accepted steps
+        history: List of the parameter arrays at each iteration
+        residual: Model stress minus measured stress at the fitted parameters
+        rmse: Root mean square of the residual
+        r_squared: Coefficient of determination of the fit
+        stderr: Estimated standard error of each fitted parameter. NaN if there are no more measurements than parameters, if the parameter does not affect the fit, or if the fit is too badly conditioned to give a positive variance.
+        unidentifiable: List of the names of the parameters that do not affect the fitted curve
+        message: Description of why the calibration stopped
+    """
+
+    def __init__(self, params: np.ndarray, converged: bool, history: list, residual: np.ndarray, stress: np.ndarray, J: np.ndarray, message: str):
+        """Constructs the result and computes the fit statistics.
+
+        Args:
+            params: Fitted parameters (E, Ep, Y0).
+            converged: Whether one of the tolerances was reached.
+            history: List of the parameter arrays at each iteration.
+            residual: Model stress minus measured stress at the fitted parameters.
+            stress: Measured stress.
+            J: Jacobian of the residual with respect to the parameters at the fitted parameters.
+            message: Description of why the calibration stopped.
+        """
+        self.params = params
+        self.E, self.Ep, self.Y0 = params
+        self.converged = converged
+        self.history = history
+        self.iterations = len(history) - 1
+        self.residual = residual
+        self.message = message
+        # Parameters whose Jacobian column is zero cannot be determined from the curve
+        unused = unused_parameters(J)
+        self.unidentifiable = [name for name, u in zip(PARAMETERS, unused) if u]
+
+        # Goodness of fit
+        N = len(residual)
+        sse = residual @ residual
+        sst = np.sum((stress - np.mean(stress))**2)
+        self.rmse = np.sqrt(sse/N)
+        self.r_squared = 1 - sse/sst if sst > 0 else np.nan
+
+        # Parameter standard errors from the linearized covariance s^2 (J^T J)^-1. The pseudo-inverse keeps rank deficient fits from crashing.
+        dof = N - len(params)
+        if dof > 0:
+            with np.errstate(invalid='ignore'):
+                self.stderr = np.sqrt(np.diag(sse/dof*la.pinv(J.T @ J)))
+            self.stderr[unused] = np.nan
+        else:
+            self.stderr = np.full(len(params), np.nan)
+
+    def __str__(self):
+        """Functions that dictates how the object is converted to a string. Mostly used for printouts
+
+        Returns:
+            String representation of the object
+        """
+        return ("""Calibration %s after %i iterations: %s
+Elastic Module: %f +/- %f
+Secondary Module: %f +/- %f
+Yield Strength: %f +/- %f
+RMSE: %f
+R^2: %f""") % ('converged' if self.converged else 'did not converge', self.iterations, self.message,
+               self.E, self.stderr[0], self.Ep, self.stderr[1], self.Y0, self.stderr[2], self.rmse, self.r_squared)
+
+def calibrate(strain: np.ndarray, stress: np.ndarray, E: float, Ep: float, Y0: float, modulustype: str = 't', model: str | Callable = 'k',
+              tol: float = 1e-6, steptol: float = 1e-10, ftol: float = 1e-12, maxiter: int = 50, eps: float = 2.22e-16) -> CalibrationResult:
+    """Fits E, Ep and Y0 of an EPMaterial to a measured stress-strain curve using the Levenberg-Marquardt method.
+
+    Every trial step replays the center and all perturbed parameter sets of the center difference Jacobian in one vectorized pass. Steps are solved as damped least squares problems and are only taken if they reduce the residual and keep E, Ep and Y0 positive, with Ep < E for a tangent modulus.
+
+    Args:
+        strain: Measured total strain, starting from an unstrained material.
+        stress: Measured stress at each strain.
+        E: Initial guess for the elastic modulus.
+        Ep: Initial guess for the secondary modulus.
+        Y0: Initial guess for the yield strength. The initial guess must describe a physical material.
+        modulustype: Type of the secondary modulus. See EPMaterial. Default 't'.
+        model: Hardening model. See EPMaterial. Default 'k'.
+        tol: Stops once the norm of the residual is at or below tol. Default 1e-6, must be positive.
+        steptol: Stops once the step is at or below steptol relative to the parameters. Default 1e-10, must be positive.
+        ftol: Stops once the residual norm changes by at most ftol relative to the previous iteration. Default 1e-12, must be positive.
+        maxiter (int): Maximum number of iterations. Default 50. Must be positive.
+        eps: Machine epsilon used to size the center difference. Must be positive.
+
+    Returns:
+        CalibrationResult with the fitted parameters and fit statistics.
+    """
+    strain = np.asarray(strain, dtype=np.float64)
+    stress = np.asarray(stress, dtype=np.float64)
+
+    # Checks inputs for proper ranges
+    if len(strain.shape) != 1 or strain.shape != stress.shape:
+        raise Exception('Strain and stress must be 1D arrays of the same length')
+    if tol <= 0 or steptol <= 0 or ftol <= 0:
+        raise Exception('Tolerances must be positive')
+    if maxiter <= 0:
+        raise Exception('Maximum number of iterations must be positive')
+    if eps <= 0:
+        raise Exception('Epsilon parameter must be positive')
+
+    p = np.array([E, Ep, Y0], dtype=np.float64)
+    if not feasible(p, modulustype):
+        raise Exception('Initial guess must have positive E, Ep and Y0, with Ep < E for a tangent modulus')
+
+    Np = len(p)
+
+    def evaluate(p):
+        # Replays the center, forward and backward parameter sets in one pass. Difference sizes follow newton.jacobian.
+        dp = np.abs(p)*np.sqrt(eps)
+        dp[dp < eps] = eps
+        P = np.vstack([p, p + np.diag(dp), p - np.diag(dp)])
+        S = replay(P, strain, modulustype, model)
+        J = ((S[1:Np+1] - S[Np+1:]) / (2*dp[:, None])).T
+        return S[0] - stress, J
+
+    history = [p]
+    converged = False
+    message = 'Maximum number of iterations reached'
+    r, J = evaluate(p)
+    rnorm = la.norm(r)
+    damping = 1e-3
+
+    for i in range(maxiter + 1):
+        if rnorm <= tol:
+            converged = True
+            message = 'Residual tolerance reached'
+            break
+        if i == maxiter:
+            break
+
+        # Levenberg-Marquardt step. Solves the damped least squares problem [J; sqrt(damping) D] step = [r; 0], where D scales each parameter by its column norm.
+        # Zero columns get no step, and the damping is raised until the step keeps the parameters physical and reduces the residual.
+        D = np.diag(la.norm(J, axis=0))
+        accepted = False
+        while damping <= 1e12:
+            A = np.vstack([J, np.sqrt(damping)*D])
+            step = la.lstsq(A, np.concatenate([r, np.zeros(Np)]), rcond=None)[0]
+            trial = p - step
+            if feasible(trial, modulustype):
+                r_trial, J_trial = evaluate(trial)
+                if la.norm(r_trial) < rnorm:
+                    accepted = True
+                    break
+            damping *= 10
+        if not accepted:
+            converged = True
+            message = 'Residual cannot be reduced further'
+            break
+
+        rnorm_prev = rnorm
+        p, r, J = trial, r_trial, J_trial
+        rnorm = la.norm(r)
+        history.append(p)
+        damping = max(damping/10, 1e-12)
+
+        # Checks the early stopping tolerances
+        if la.norm(step) <= steptol*la.norm(p):
+            converged = True
+            message = 'Step tolerance reached'
+            break
+        if rnorm_prev - rnorm <= ftol*rnorm_prev:
+            converged = True
+            message = 'Residual change tolerance reached'
+            break
+
+    # Parameters that do not affect the curve cannot be fit. A fit that stops short of the residual tolerance with them has not converged to a meaningful answer.
+    unused = [name for name, u in zip(PARAMETERS, unused_parameters(J)) if u]
+    if unused:
+        deficiency = '%s do not affect the fit' % ', '.join(unused)
+        if rnorm > tol:
+            converged = False
+            message = deficiency
+        else:
+            message = message + '. ' + deficiency
+
+    return CalibrationResult(p, converged, history, r, stress, J, message)
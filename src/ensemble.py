@@ -0,0 +1,157 @@
+import os
+import numpy as np
+from multiprocessing import Pool, shared_memory
+from typing import Callable
+from hardening import EPMaterial
+
+# Number of values stored per step, matching the length of EPMaterial.return_state()
+NSTATE = 5
+
+# Worker-side handles to the shared arrays. Set once per process by attach_shared().
+_shared = {}
+
+def build_material(config) -> EPMaterial:
+    """Constructs an EPMaterial from an ensemble configuration.
+
+    Args:
+        config: Either a dictionary of EPMaterial keyword arguments or a sequence of positional arguments in the order (E, Ep, modulustype, Y0, model, ...).
+
+    Returns:
+        Freshly constructed EPMaterial.
+    """
+    if isinstance(config, dict):
+        return EPMaterial(**config)
+    else:
+        return EPMaterial(*config)
+
+def attach_shared(results_name: str, paths_name: str, results_shape: tuple, paths_shape: tuple, configs: list):
+    """Attaches the current process to the shared result and strain path arrays. Used as the pool initializer.
+
+    Args:
+        results_name: Name of the shared memory block holding the results.
+        paths_name: Name of the shared memory block holding the strain paths.
+        results_shape: Shape of the results array (Nconfig, Npath, Nsteps, NSTATE).
+        paths_shape: Shape of the strain path array (Npath, Nsteps).
+        configs: List of material configurations.
+    """
+    results_shm = shared_memory.SharedMemory(name=results_name)
+    paths_shm = shared_memory.SharedMemory(name=paths_name)
+    _shared['results'] = np.ndarray(results_shape, dtype=np.float64, buffer=results_shm.buf)
+    _shared['paths'] = np.ndarray(paths_shape, dtype=np.float64, buffer=paths_shm.buf)
+    _shared['configs'] = configs
+    # Handles are stored last so the array views are released before the blocks are closed
+    _shared['handles'] = (results_shm, paths_shm)
+
+def run_chunk(chunk: tuple) -> int:
+    """Runs a contiguous range of (configuration, path) tasks and writes the state history into the shared results.
+
+    Args:
+        chunk: Tuple (start, stop) of flat task indices. Task k corresponds to configuration k // Npath and path k % Npath.
+
+    Returns:
+        Number of tasks completed.
+    """
+    results = _shared['results']
+    paths = _shared['paths']
+    configs = _shared['configs']
+    Npath = paths.shape[0]
+
+    start, stop = chunk
+    for k in range(start, stop):
+        c, p = divmod(k, Npath)
+        mat = build_material(configs[c])
+        # Replays the strain path, storing the state after every increment
+        for j, dstrain in enumerate(paths[p]):
+            mat.update_state(dstrain)
+            results[c, p, j, :] = mat.return_state()
+    return stop - start
+
+def run_ensemble(configs: list, paths: np.ndarray, processes: int = None, chunksize: int = None, progress: bool | Callable = False) -> np.ndarray:
+    """Runs every material configuration over every strain path across a process pool.
+
+    Results are written by the workers directly into a shared memory array rather than being pickled back to the parent.
+
+    Args:
+        configs: List of material configurations. Each is a dictionary of EPMaterial keyword arguments or a sequence of positional arguments (E, Ep, modulustype, Y0, model). Custom hardening models must be picklable (defined at module level).
+        paths: Strain increments applied to each material. Must be a 2D array of shape (Npath, Nsteps), or 1D for a single path.
+        processes: Number of worker processes. Defaults to the number of CPUs. A value of 1 runs in the current process.
+        chunksize: Number of (configuration, path) tasks handed to a worker at a time. Defaults to splitting the work into roughly four chunks per process.
+        progress: Either True to print progress after every chunk or a function progress(done, total) that is called after every chunk. Default False.
+
+    Returns:
+        results: Array of shape (Nconfig, Npath, Nsteps, 5) with the output of return_state() after every strain increment.
+    """
+    # Converts a single path into a 2D array of paths
+    paths = np.array(paths, dtype=np.float64)
+    if len(paths.shape) == 1:
+        paths = paths.reshape(1, -1)
+
+    # Checks inputs for proper ranges
+    if len(configs) == 0:
+        raise Exception('At least one material configuration must be given')
+    if len(paths.shape) != 2:
+        raise Exception('Strain paths must be a 1D or 2D array')
+    if processes is None:
+        processes = os.cpu_count() or 1
+    if processes <= 0:
+        raise Exception('Number of processes must be positive')
+    if chunksize is not None and chunksize <= 0:
+        raise Exception('Chunk size must be positive')
+
+    # Builds every configuration once up front so bad inputs are raised here rather than inside a worker
+    for config in configs:
+        build_material(config)
+
+    Nconfig = len(configs)
+    Npath, Nsteps = paths.shape
+    total = Nconfig*Npath
+    shape = (Nconfig, Npath, Nsteps, NSTATE)
+
+    # Splits the flat task range into chunks
+    if chunksize is None:
+        chunksize = max(1, -(-total // (4*processes)))
+    chunks = [(start, min(start + chunksize, total)) for start in range(0, total, chunksize)]
+
+    # Allocates the shared results and copies the paths into shared memory. Size is kept nonzero for empty paths.
+    results_shm = shared_memory.SharedMemory(create=True, size=max(1, int(np.prod(shape))*8))
+    paths_shm = shared_memory.SharedMemory(create=True, size=max(1, paths.nbytes))
+    try:
+        np.ndarray(paths.shape, dtype=np.float64, buffer=paths_shm.buf)[:] = paths
+        initargs = (results_shm.name, paths_shm.name, shape, paths.shape, list(configs))
+
+        done = 0
+        if processes == 1:
+            # Runs serially in the current process using the same worker code
+            attach_shared(*initargs)
+            for n in map(run_chunk, chunks):
+                done += n
+                report_progress(progress, done, total)
+        else:
+            with Pool(processes, initializer=attach_shared, initargs=initargs) as pool:
+                for n in pool.imap_unordered(run_chunk, chunks):
+                    done += n
+                    report_progress(progress, done, total)
+
+        # Copies the results out before the shared block is released
+        results = np.ndarray(shape, dtype=np.float64, buffer=results_shm.buf).copy()
+    finally:
+        _shared.clear()
+        results_shm.close()
+        results_shm.unlink()
+        paths_shm.close()
+        paths_shm.unlink()
+
+    return results
+
+def report_progress(progress: bool | Callable, done: int, total: int):
+    """Reports the progress of an ensemble run.
+
+    Args:
+        progress: True to print the progress, a function progress(done, total) to call, or False to do nothing.
+        done: Number of tasks completed.
+        total: Total number of tasks.
+    """
+    if callable(progress):
+        progress(done, total)
+    elif progress:
+        print("Completed %i of %i tasks" % (done, total))
@@ -1,5 +1,6 @@
 import numpy as np
 from typing import Callable
+from stats import SolverStats
 
 def kinematic(self, state):
     """Plastic deformation model for kinematic hardening that is passed into the EPMaterial object
@@ -45,6 +46,7 @@ class EPMaterial:
         stress: Current stress
         strain: Current total strain
         pstrain: Current plastic strain
+        stats: Optional SolverStats collecting the number of updates, plastic model calls and time spent. Its converged flag is not used.
 
     Methods:
         trial_elastic(strain): returns the elastic stress for a given strain
@@ -53,7 +55,7 @@ class EPMaterial:
         return_state(): returns a tuple of the stress, total strain, plastic strain, yield strength, and yield center
     """
 
-    def __init__(self, E:float, Ep:float, modulustype:str, Y0:float, model: str | Callable, alpha:float=0, stress:float=0, strain:float=0, pstrain:float=0):
+    def __init__(self, E:float, Ep:float, modulustype:str, Y0:float, model: str | Callable, alpha:float=0, stress:float=0, strain:float=0, pstrain:float=0, stats:SolverStats=None):
         """Constructs elastoplastic material using the specific properties and hardening model
 
         Args:
@@ -66,6 +68,7 @@ class EPMaterial:
             stress: Starting stress. Defaults to 0.
             strain: Starting total strain. Defaults to 0.
             pstrain: Starting plastic strain. Defaults to 0.
+            stats: Optional SolverStats filled in by update_state. niter counts updates, nfev and time_f count the calls and time of the plastic model, and time_total the time of the updates. converged is not used for materials. Defaults to None for no tracking.
         """
         # Sets initial values
         self.Y0 = Y0
@@ -98,6 +101,11 @@ class EPMaterial:
             self.modelname = 'Custom'
             self.deformation_plastic = model
 
+        # Wraps the plastic model so its calls are counted and timed
+        self.stats = stats
+        if stats is not None:
+            self.deformation_plastic = stats.wrap(self.deformation_plastic)
+
     def deformation_elastic(self, strain):
         """Performs stress calculation from a given strain assuming fully elastic deformation.
 
@@ -113,9 +121,13 @@ class EPMaterial:
     def update_state(self, strain):
         """Updates the state of the system for a given change in total strain.
 
+        The material properties may be numpy arrays of the same length, in which case every entry is updated as a separate material. Custom hardening models must then accept an array state.
+
         Args:
             strain: Change in strain the system undergoes
         """
+        if self.stats is not None:
+            self.stats.start()
         # Updates strain and elastic stress
         self.strain += strain
         self.stress += self.deformation_elastic(strain)
@@ -123,8 +135,16 @@ class EPMaterial:
         eta = self.stress - self.alpha
         state = abs(eta) - self.Y0
         # Updates the  deformation based on the defined plastic deformation
-        if state > 0:
+        if np.ndim(state) > 0:
+            # Array-valued properties replay several materials at once. Entries still in the elastic regime get a zero state.
+            state = np.maximum(state, 0)
+            if np.any(state > 0):
+                self.deformation_plastic(self, state)
+        elif state > 0:
             self.deformation_plastic(self, state)
+        if self.stats is not None:
+            self.stats.niter += 1
+            self.stats.stop()
 
     def __str__(self):
         """Functions that dictates how the object is converted to a string. Mostly used for printouts
@@ -1,6 +1,7 @@
 import numpy as np
 from numpy import linalg as la
 from typing import Callable
+from stats import SolverStats
 
 def jacobian(f: Callable[[np.ndarray], np.ndarray], x: np.ndarray, eps:float=2.22e-16) -> np.ndarray:
     """Computes the Jacobian matrix for a function f(x) based on an input x using the center difference method.
@@ -68,7 +69,27 @@ def floatarray_extract(x):
     else:
         return x
 
-def newton(f: Callable[[np.ndarray], np.ndarray], x0: np.ndarray, tol:float = 1e-6, maxiter:int = 50, eps=2.22e-16):
+def generalized_inverse(J: np.ndarray) -> np.ndarray:
+    """Computes the generalized inverse of a Jacobian matrix as described in the README.
+
+    Args:
+        J: Jacobian matrix with Nf rows and Nx columns.
+
+    Returns:
+        Square inverse if Nx == Nf, right inverse if Nx > Nf and left inverse if Nx < Nf.
+    """
+    Nf, Nx = J.shape
+    if Nx == Nf:
+        # Square inverse
+        return la.inv(J)
+    elif Nx > Nf:
+        # Right inverse
+        return J.T @ la.inv(J @ J.T)
+    else:
+        # Left inverse
+        return la.inv(J.T @ J) @ J.T
+
+def newton(f: Callable[[np.ndarray], np.ndarray], x0: np.ndarray, tol:float = 1e-6, maxiter:int = 50, eps=2.22e-16, stats:SolverStats = None, callback:Callable = None):
     """Finds the value value y = f(x) where norm(y) = 0. 
 
     Args:
@@ -77,11 +98,19 @@ def newton(f: Callable[[np.ndarray], np.ndarray], x0: np.ndarray, tol:float = 1e
         tol: Convergence tolerance for bisection method. Default 1e-6, must be positive.
         N (int): Maximum number of loops. Default 50. Must be positive.
         eps: Interval scaling factor used in center difference method. Must be positive.
+        stats: Optional SolverStats that is filled in with the evaluation counts, residuals and timings of the call.
+        callback: Optional function callback(i, x, y) called after every iteration with the new guess x and its value y = f(x).
     
     Returns:
         x: List of guesses
         y: List of values for f(x)
     """
+    # Sets up the statistics. f is only wrapped when they were requested to avoid the timing overhead.
+    if stats is None:
+        stats = SolverStats()
+    else:
+        f = stats.wrap(f)
+    stats.start()
 
     # Initializes the list of guesses and values. Floatarray_convert is used to handle if the input or output is a scalar
     x = [floatarray_convert(x0)]
@@ -101,41 +130,31 @@ def newton(f: Callable[[np.ndarray], np.ndarray], x0: np.ndarray, tol:float = 1e
     if len(y[0].shape) > 1:
         raise Exception('Function output must be 1D numpy array or scalar')
     
-    # Gets the number of input and output dimensions
-    Nx = len(x[0])
-    Nf = len(y[0])
-    
     # Checks if input guess is good enough as-is
-    if la.norm(y[0]) <= tol:
+    stats.residuals.append(la.norm(y[0]))
+    if stats.residuals[-1] <= tol:
+        stats.stop(True)
         return x, y
     
     # Main iterative loop
     for i in range(maxiter):
         # Calculates the Jacobian of the function at the input
         J = jacobian(f, x[i], eps=eps)
+        stats.njev += 1
         # Performs the relevant generalized inverse as described in the README then appends the change to the guess list
-        if Nx == Nf:
-            # Square inverse
-            x.append(x[i] - la.inv(J) @ y[i])
-        elif Nx > Nf:
-            # Right inverse
-            x.append(x[i] - J.T @ la.inv(J @ J.T) @ y[i])
-        else:
-            # Left inverse
-            x.append(x[i] - la.inv(J.T @ J) @ J.T @ y[i])
+        x.append(x[i] - generalized_inverse(J) @ y[i])
+        stats.nsolve += 1
         # Appends the result of the guess to the results list
         y.append(floatarray_convert(f(floatarray_extract(x[i+1]))))
+        stats.niter += 1
+        stats.residuals.append(la.norm(y[i+1]))
+        if callback is not None:
+            callback(i, x[i+1], y[i+1])
         
         # Returns the lists if the tolerance is reached
-        if la.norm(y[i+1]) <= tol:
+        if stats.residuals[-1] <= tol:
+            stats.stop(True)
             return x, y
 
+    stats.stop(False)
     return x, y
-
-# Basic check for vector -> scalar function
-def f(x):
-    return np.array([x**4 - np.sin(x), x**5 - x**3 + 2])
-
-x, y = newton(f, 2)
-print(x)
-print(y)
\ No newline at end of file
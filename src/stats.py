@@ -0,0 +1,145 @@
+import time
+import numpy as np
+from functools import wraps
+from typing import Callable
+
+class SolverStats:
+    """Class that collects counters and timings from a solver call.
+
+    An empty SolverStats is passed into a solver through its stats argument and is filled in during the call. Counters and timings accumulate if the same object is passed to several calls, while the residuals and the convergence estimates describe the most recent call only.
+
+    Attributes:
+        nfev: Number of evaluations of the user function f
+        njev: Number of Jacobian builds
+        nsolve: Number of linear solves
+        niter: Number of iterations
+        converged: Whether the solver reached its tolerance
+        residuals: List of the residual norm at each iteration of the most recent call
+        time_f: Time spent inside the user function f in seconds
+        time_total: Total time spent in the solver call in seconds
+
+    Methods:
+        wrap(f): returns f wrapped so its calls are counted and timed
+        start(): marks the start of a solver call and starts a new residual history
+        stop(converged): marks the end of a solver call, optionally recording whether it converged
+        overhead(): returns the time spent in the solver outside of f
+        convergence_rate(): returns the ratio between successive residuals
+        convergence_order(): returns the estimated order of convergence between successive residuals
+        as_dict(): returns the counters and timings as a dictionary
+    """
+
+    def __init__(self):
+        """Constructs an empty set of statistics."""
+        self.nfev = 0
+        self.njev = 0
+        self.nsolve = 0
+        self.niter = 0
+        self.converged = False
+        self.residuals = []
+        self.time_f = 0.0
+        self.time_total = 0.0
+        self._start = None
+
+    def wrap(self, f: Callable) -> Callable:
+        """Wraps a function so that every call is counted in nfev and timed in time_f.
+
+        Args:
+            f: Function to wrap. The signature is preserved.
+
+        Returns:
+            Wrapped function.
+        """
+        @wraps(f)
+        def counted(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return f(*args, **kwargs)
+            finally:
+                self.time_f += time.perf_counter() - t0
+                self.nfev += 1
+        return counted
+
+    def start(self):
+        """Marks the start of a solver call. Clears the residuals so rates are never estimated across two calls."""
+        self._start = time.perf_counter()
+        self.residuals = []
+
+    def stop(self, converged: bool = None):
+        """Marks the end of a solver call and adds the elapsed time to time_total.
+
+        Args:
+            converged: Whether the solver reached its tolerance. Defaults to None, which leaves converged unchanged for callers without a notion of convergence.
+        """
+        self.time_total += time.perf_counter() - self._start
+        if converged is not None:
+            self.converged = converged
+
+    def overhead(self) -> float:
+        """Returns the time spent in the solver outside of the user function f.
+
+        Returns:
+            Overhead time in seconds.
+        """
+        return self.time_total - self.time_f
+
+    def convergence_rate(self) -> np.ndarray:
+        """Estimates the rate of convergence as the ratio between successive residuals, e_(k+1)/e_k.
+
+        Returns:
+            Array of ratios. Values below 1 mean the residual is shrinking.
+        """
+        e = np.array(self.residuals, dtype=np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return e[1:]/e[:-1]
+
+    def convergence_order(self) -> np.ndarray:
+        """Estimates the order of convergence q from three successive residuals using q = log(e_(k+1)/e_k)/log(e_k/e_(k-1)).
+
+        Returns:
+            Array of order estimates. Close to 1 for linear and 2 for quadratic convergence.
+        """
+        rate = self.convergence_rate()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.log(rate[1:])/np.log(rate[:-1])
+
+    def as_dict(self) -> dict:
+        """Returns the counters and timings as a dictionary, e.g. to feed into a metrics system.
+
+        Returns:
+            Dictionary of the statistics. The rate and order entries are the last estimates available, or NaN.
+        """
+        rate = self.convergence_rate()
+        order = self.convergence_order()
+        return {
+            'nfev': self.nfev,
+            'njev': self.njev,
+            'nsolve': self.nsolve,
+            'niter': self.niter,
+            'converged': self.converged,
+            'residual': self.residuals[-1] if self.residuals else np.nan,
+            'rate': rate[-1] if len(rate) > 0 else np.nan,
+            'order': order[-1] if len(order) > 0 else np.nan,
+            'time_f': self.time_f,
+            'time_overhead': self.overhead(),
+            'time_total': self.time_total,
+        }
+
+    def __str__(self):
+        """Functions that dictates how the object is converted to a string. Mostly used for printouts
+
+        Returns:
+            String representation of the object
+        """
+        d = self.as_dict()
+        return ("""Solver Statistics (%s)
+Iterations: %i
+Function Evaluations: %i
+Jacobian Builds: %i
+Linear Solves: %i
+Final Residual: %g
+Convergence Rate: %g
+Convergence Order: %g
+Time in f: %f s
+Solver Overhead: %f s
+Total Time: %f s""") % ('converged' if d['converged'] else 'not converged', d['niter'], d['nfev'], d['njev'], d['nsolve'],
+                        d['residual'], d['rate'], d['order'], d['time_f'], d['time_overhead'], d['time_total'])
@@ -0,0 +1,111 @@
+import json
+import pytest
+import numpy as np
+from benchmark import run_benchmarks, run_workload, compare, main, cyclic_increments, WORKLOADS
+
+def baseline():
+    return {'scale': 1.0, 'results': {'w': {'time': 1.0, 'nfev': 100, 'peak_memory': 1000}}}
+
+def test_workloads():
+    # Runs every workload at a small scale
+    current = run_benchmarks(scale=0.01, repeat=1, mintime=0)
+    assert list(current['results']) == list(WORKLOADS)
+    for result in current['results'].values():
+        assert result['time'] > 0
+        assert result['nfev'] > 0
+        assert result['peak_memory'] > 0
+
+def test_deterministic_nfev():
+    # The f evaluation counts must not change between runs for the nfev check to work
+    a = run_workload(WORKLOADS['newton_dense'], scale=0.01, repeat=1, mintime=0)
+    b = run_workload(WORKLOADS['newton_dense'], scale=0.01, repeat=1, mintime=0)
+    assert a['nfev'] == b['nfev']
+
+def test_no_regression():
+    current = {'scale': 1.0, 'results': {'w': {'time': 1.2, 'nfev': 100, 'peak_memory': 900}}}
+    assert compare(current, baseline(), threshold=0.25) == []
+
+def test_regressions():
+    current = {'scale': 1.0, 'results': {'w': {'time': 1.3, 'nfev': 101, 'peak_memory': 1300}}}
+    regressions = compare(current, baseline(), threshold=0.25)
+    assert len(regressions) == 3
+    assert "time" in regressions[0]
+    assert "peak_memory" in regressions[1]
+    assert "nfev" in regressions[2]
+
+def test_missing_workload():
+    # Workloads missing from the baseline are skipped
+    current = {'scale': 1.0, 'results': {'v': {'time': 5.0, 'nfev': 500, 'peak_memory': 5000}}}
+    assert compare(current, baseline()) == []
+
+def test_scale_mismatch():
+    current = {'scale': 0.5, 'results': {}}
+    with pytest.raises(Exception) as exc_info:
+        compare(current, baseline())
+
+    assert "Scale" in str(exc_info.value)
+
+def test_bad_threshold():
+    with pytest.raises(Exception) as exc_info:
+        compare(baseline(), baseline(), threshold=-1)
+
+    assert "Threshold" in str(exc_info.value)
+
+def test_bad_repeat():
+    with pytest.raises(Exception) as exc_info:
+        run_workload(WORKLOADS['newton_dense'], repeat=0)
+
+    assert "repeats" in str(exc_info.value)
+
+def test_unknown_workload():
+    with pytest.raises(Exception) as exc_info:
+        run_benchmarks(['q'])
+
+    assert "Unknown" in str(exc_info.value)
+
+def test_main(tmp_path):
+    # Saves a baseline then compares against it, and against a baseline that is impossible to meet
+    path = tmp_path / 'baseline.json'
+    args = ['--scale', '0.01', '--repeat', '1', '--mintime', '0', '--only', 'newton_banded']
+    assert main(args + ['--save', str(path)]) == 0
+    assert main(args + ['--compare', str(path), '--threshold', '100']) == 0
+
+    with open(path) as file:
+        saved = json.load(file)
+    saved['results']['newton_banded']['nfev'] = 0
+    with open(path, 'w') as file:
+        json.dump(saved, file)
+    assert main(args + ['--compare', str(path)]) == 1
+
+def test_cyclic_path():
+    # The hardening path must be a symmetric triangle wave between +/-0.05
+    strain = np.cumsum(cyclic_increments(1000))
+    assert abs(strain.max() - 0.05) <= 1e-12
+    assert abs(strain.min() + 0.05) <= 1e-12
+    assert abs(strain[99] - 0.05) <= 1e-12
+    assert abs(strain[299] + 0.05) <= 1e-12
+
+def test_bad_mintime():
+    with pytest.raises(Exception) as exc_info:
+        run_workload(WORKLOADS['newton_dense'], mintime=-1)
+
+    assert "Minimum time" in str(exc_info.value)
+
+def test_uninstrumented_memory():
+    # Peak memory covers the solver alone, so it must not grow with the number of bisection solves sharing the inputs
+    small = run_workload(WORKLOADS['bisection_scalar'], scale=0.05, repeat=1, mintime=0)
+    large = run_workload(WORKLOADS['bisection_scalar'], scale=0.5, repeat=1, mintime=0)
+    assert large['nfev'] == 10*small['nfev']
+    assert large['peak_memory'] <= 2*small['peak_memory']
+
+def test_min_passes():
+    # Counts the runs of a stub workload: one counting pass, one memory pass and at least repeat timed passes
+    calls = []
+    def workload(scale):
+        def run(stats):
+            calls.append(stats)
+        return run
+    run_workload(workload, repeat=4, mintime=0)
+    assert len(calls) == 6
+    assert calls[0] is not None
+    assert all(stats is None for stats in calls[1:])
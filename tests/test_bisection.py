@@ -1,4 +1,5 @@
 from bisection import bisection
+from stats import SolverStats
 import pytest
 
 @pytest.mark.timeout(300)
@@ -111,4 +112,45 @@ def test_autosuccess_b():
     def f(x):
         return x**2 - 1
     x0, y0 = bisection(f, a, b)
-    assert x0[-1] == b
\ No newline at end of file
+    assert x0[-1] == b
+
+def test_stats():
+    # Checks the counters filled in by the solver
+    a = -2
+    b = 5
+    def f(x):
+        return x*(2**x)
+    stats = SolverStats()
+    x0, y0 = bisection(f, a, b, stats=stats)
+    assert stats.converged
+    assert stats.niter == len(x0)
+    # Six evaluations are spent checking and initializing the bounds
+    assert stats.nfev == len(x0) + 6
+    assert stats.residuals == [abs(y) for y in y0]
+    assert stats.time_total >= stats.time_f
+
+def test_stats_autosuccess():
+    def f(x):
+        return x**2 - 1
+    stats = SolverStats()
+    bisection(f, -1, 2, stats=stats)
+    assert stats.converged
+    assert stats.niter == 0
+
+def test_stats_maxiter():
+    def f(x):
+        return x*(2**x)
+    stats = SolverStats()
+    bisection(f, -2, 5, tol=1e-12, N=5, stats=stats)
+    assert not stats.converged
+    assert stats.niter == 5
+
+def test_callback():
+    # Checks that the callback sees every midpoint
+    def f(x):
+        return x*(2**x)
+    calls = []
+    def callback(i, m, M):
+        calls.append((i, m, M))
+    x0, y0 = bisection(f, -2, 5, callback=callback)
+    assert calls == list(zip(range(len(x0)), x0, y0))
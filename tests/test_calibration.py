@@ -0,0 +1,138 @@
+import pytest
+import numpy as np
+from calibration import calibrate, replay
+from hardening import EPMaterial
+
+def cyclic_strain():
+    # Loading, reverse loading and reloading history
+    return np.concatenate([np.linspace(0, 0.05, 50), np.linspace(0.05, -0.05, 100)[1:], np.linspace(-0.05, 0.05, 100)[1:]])
+
+def test_replay():
+    # Checks the vectorized replay against updating each material separately
+    strain = cyclic_strain()
+    params = np.array([[1000, 100, 10], [2000, 50, 5]])
+    stress = replay(params, strain, 't', 'k')
+    dstrain = np.diff(strain, prepend=0)
+    for k in range(2):
+        mat = EPMaterial(*params[k, :2], 't', params[k, 2], 'k')
+        correct = np.zeros(len(strain))
+        for j in range(len(strain)):
+            mat.update_state(dstrain[j])
+            correct[j] = mat.stress
+        assert np.linalg.norm(correct - stress[k]) <= 10e-9
+
+def test_kinematic():
+    # Recovers the parameters used to generate the curve
+    strain = cyclic_strain()
+    stress = replay(np.array([1000, 100, 10]), strain, 't', 'k')[0]
+    result = calibrate(strain, stress, 900, 120, 8, 't', 'k')
+
+    assert result.converged
+    assert np.linalg.norm(result.params - np.array([1000, 100, 10])) <= 1e-4
+
+def test_isotropic():
+    strain = cyclic_strain()
+    stress = replay(np.array([1000, 100, 10]), strain, 'p', 'i')[0]
+    result = calibrate(strain, stress, 900, 120, 8, 'p', 'i')
+
+    assert result.converged
+    assert np.linalg.norm(result.params - np.array([1000, 100, 10])) <= 1e-4
+
+def test_noisy():
+    # Checks the fit statistics on a noisy curve
+    strain = cyclic_strain()
+    stress = replay(np.array([1000, 100, 10]), strain, 't', 'k')[0]
+    noisy = stress + np.random.default_rng(0).normal(0, 0.1, len(stress))
+    result = calibrate(strain, noisy, 900, 120, 8, 't', 'k')
+
+    assert result.converged
+    assert abs(result.rmse - 0.1) <= 0.02
+    assert result.r_squared > 0.999
+    assert np.all(np.abs(result.params - np.array([1000, 100, 10])) <= 5*result.stderr)
+
+def test_maxiter():
+    # Checks that running out of iterations is reported
+    strain = cyclic_strain()
+    stress = replay(np.array([1000, 100, 10]), strain, 't', 'k')[0]
+    result = calibrate(strain, stress, 900, 120, 8, 't', 'k', maxiter=1)
+
+    assert not result.converged
+    assert result.iterations == 1
+
+def test_print():
+    strain = cyclic_strain()
+    stress = replay(np.array([1000, 100, 10]), strain, 't', 'k')[0]
+    print(calibrate(strain, stress, 900, 120, 8, 't', 'k'))
+    pass
+
+def test_bad_shape():
+    with pytest.raises(Exception) as exc_info:
+        calibrate(np.zeros(5), np.zeros(4), 900, 120, 8)
+
+    assert "same length" in str(exc_info.value)
+
+def test_bad_tol():
+    strain = cyclic_strain()
+    with pytest.raises(Exception) as exc_info:
+        calibrate(strain, strain, 900, 120, 8, steptol=-1)
+
+    assert "Tolerances" in str(exc_info.value)
+
+def test_bad_maxiter():
+    strain = cyclic_strain()
+    with pytest.raises(Exception) as exc_info:
+        calibrate(strain, strain, 900, 120, 8, maxiter=0)
+
+    assert "Maximum" in str(exc_info.value)
+
+def test_bad_eps():
+    strain = cyclic_strain()
+    with pytest.raises(Exception) as exc_info:
+        calibrate(strain, strain, 900, 120, 8, eps=-1)
+
+    assert "Epsilon" in str(exc_info.value)
+
+def test_elastic_only():
+    # A curve that never yields only determines E
+    strain = np.linspace(0, 0.005, 50)
+    result = calibrate(strain, 1000*strain, 900, 120, 8)
+
+    assert result.converged
+    assert abs(result.E - 1000) <= 1e-4
+    assert result.unidentifiable == ['Ep', 'Y0']
+    assert np.isnan(result.stderr[1]) and np.isnan(result.stderr[2])
+    assert "Ep, Y0 do not affect the fit" in result.message
+
+def test_yield_above_data():
+    # A starting yield strength above the measured stress never yields, so Ep and Y0 cannot be fit
+    strain = cyclic_strain()
+    stress = replay(np.array([1000, 100, 10]), strain, 't', 'k')[0]
+    result = calibrate(strain, stress, 900, 120, 100, 't', 'k')
+
+    assert not result.converged
+    assert result.unidentifiable == ['Ep', 'Y0']
+    assert np.isnan(result.stderr[1]) and np.isnan(result.stderr[2])
+    assert "Ep, Y0" in result.message
+
+def test_far_starts():
+    # Starting points where an undamped Gauss-Newton step leaves the physical range
+    strain = cyclic_strain()
+    cases = [('p', (500, 300, 5)), ('p', (1000, 900, 10)), ('t', (500, 300, 5))]
+    for modulustype, start in cases:
+        stress = replay(np.array([1000, 100, 10]), strain, modulustype, 'i')[0]
+        result = calibrate(strain, stress, *start, modulustype, 'i')
+
+        assert result.converged
+        assert np.linalg.norm(result.params - np.array([1000, 100, 10])) <= 1e-4
+        for p in result.history:
+            assert np.all(p > 0)
+            if modulustype == 't':
+                assert p[1] < p[0]
+
+def test_bad_guess():
+    # A tangent modulus above the elastic modulus is not a physical material
+    strain = cyclic_strain()
+    with pytest.raises(Exception) as exc_info:
+        calibrate(strain, strain, 100, 120, 8, 't', 'k')
+
+    assert "Initial guess" in str(exc_info.value)
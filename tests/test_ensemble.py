@@ -0,0 +1,92 @@
+import pytest
+import numpy as np
+from ensemble import run_ensemble
+from hardening import EPMaterial
+
+def cyclic_paths():
+    # Two strain paths built from the same loading history
+    strain = [0, 0, 0.0075, 0.03, 0.05, 0]
+    dstrain = np.diff(strain)
+    return np.vstack([dstrain, -2*dstrain])
+
+def test_serial():
+    # Checks the ensemble output against looping over each material manually
+    configs = [(1000, 100, 't', 10, 'i'), (1000, 100, 't', 10, 'k')]
+    paths = cyclic_paths()
+    results = run_ensemble(configs, paths, processes=1)
+
+    assert results.shape == (2, 2, 5, 5)
+    for c in range(2):
+        for p in range(2):
+            mat = EPMaterial(*configs[c])
+            for j in range(5):
+                mat.update_state(paths[p, j])
+                assert np.linalg.norm(results[c, p, j, :] - mat.return_state()) <= 10e-9
+
+def test_parallel():
+    # Checks that a process pool gives the same results as a serial run
+    configs = [(1000, 100, 't', 10, 'i'), (1000, 100, 't', 10, 'k'), {'E': 2000, 'Ep': 50, 'modulustype': 'p', 'Y0': 5, 'model': 'k'}]
+    paths = cyclic_paths()
+    serial = run_ensemble(configs, paths, processes=1)
+    parallel = run_ensemble(configs, paths, processes=2, chunksize=1)
+
+    assert np.array_equal(serial, parallel)
+
+def test_single_path():
+    # Checks that a 1D path is treated as a single path
+    results = run_ensemble([(1000, 100, 't', 10, 'i')], cyclic_paths()[0], processes=1)
+
+    correct = np.array([
+        [0, 0, 0, 10, 0],
+        [7.5, 0.0075, 0, 10, 0],
+        [12, 0.03, 0.018, 12, 0],
+        [14, 0.05, 0.036, 14, 0],
+        [-16.2, 0, 0.0558, 16.2, 0]
+    ])
+
+    assert np.linalg.norm(correct - results[0, 0]) <= 10e-9
+
+def test_progress():
+    # Checks that the progress function sees every task
+    reports = []
+    def progress(done, total):
+        reports.append((done, total))
+    configs = [(1000, 100, 't', 10, 'i')]*3
+    run_ensemble(configs, cyclic_paths(), processes=1, chunksize=2, progress=progress)
+
+    assert reports == [(2, 6), (4, 6), (6, 6)]
+
+def test_print_progress():
+    run_ensemble([(1000, 100, 't', 10, 'i')], cyclic_paths(), processes=1, progress=True)
+    pass
+
+def test_bad_config():
+    # Checks that bad configurations are caught before any work is done
+    with pytest.raises(Exception) as exc_info:
+        run_ensemble([(1000, 100, 'q', 10, 'i')], cyclic_paths(), processes=1)
+
+    assert "modulus" in str(exc_info.value)
+
+def test_no_configs():
+    with pytest.raises(Exception) as exc_info:
+        run_ensemble([], cyclic_paths())
+
+    assert "configuration" in str(exc_info.value)
+
+def test_bad_paths():
+    with pytest.raises(Exception) as exc_info:
+        run_ensemble([(1000, 100, 't', 10, 'i')], np.zeros((2, 2, 2)))
+
+    assert "Strain paths" in str(exc_info.value)
+
+def test_bad_processes():
+    with pytest.raises(Exception) as exc_info:
+        run_ensemble([(1000, 100, 't', 10, 'i')], cyclic_paths(), processes=0)
+
+    assert "processes" in str(exc_info.value)
+
+def test_bad_chunksize():
+    with pytest.raises(Exception) as exc_info:
+        run_ensemble([(1000, 100, 't', 10, 'i')], cyclic_paths(), chunksize=-1)
+
+    assert "Chunk size" in str(exc_info.value)
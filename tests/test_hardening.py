@@ -1,6 +1,7 @@
 import pytest
 import numpy as np
 from hardening import EPMaterial
+from stats import SolverStats
 
 def test_isotropic():
     # Basic test of isotropic stress-strain curve
@@ -129,4 +130,44 @@ def test_print():
     # Tests print representation. I don't know how to access the print statement itself however.
     mat = EPMaterial(1000, 100, 't', 10, 'i')
     print(mat)
-    pass
\ No newline at end of file
+    pass
+
+def test_array_properties():
+    # Tests updating several materials at once using array-valued properties
+    strain = [0, 0, 0.0075, 0.03, 0.05, 0]
+    dstrain = np.diff(strain)
+    E = np.array([1000., 1000.])
+    Et = np.array([100., 100.])
+    Y0 = np.array([10., 20.])
+    mat = EPMaterial(E, Et, 't', Y0, 'i')
+    stress = np.zeros((5, 2))
+    for i in range(5):
+        mat.update_state(dstrain[i])
+        stress[i, :] = mat.stress
+
+    correct = np.array([
+        [0, 0],
+        [7.5, 7.5],
+        [12, 21],
+        [14, 23],
+        [-16.2, -23.4]
+    ])
+
+    assert np.linalg.norm(correct - stress) <= 10e-9
+
+def test_stats():
+    # Checks the update and plastic model counts
+    strain = [0, 0, 0.0075, 0.03, 0.05, 0]
+    dstrain = np.diff(strain)
+    stats = SolverStats()
+    mat = EPMaterial(1000, 100, 't', 10, 'i', stats=stats)
+    for i in range(5):
+        mat.update_state(dstrain[i])
+
+    assert stats.niter == 5
+    # Only the last three increments yield
+    assert stats.nfev == 3
+    assert stats.time_total >= stats.time_f
+    # Convergence has no meaning for a material update
+    assert not stats.converged
+    assert abs(mat.stress + 16.2) <= 10e-9
@@ -1,4 +1,5 @@
 from newton import newton
+from stats import SolverStats
 import numpy as np
 import pytest
 
@@ -95,4 +96,57 @@ def test_instant_return():
     
     x, y = newton(f, 0)
 
-    assert x[-1] == 0
\ No newline at end of file
+    assert x[-1] == 0
+
+def test_stats():
+    # Checks the counters filled in by the solver
+    def f(x):
+       return x**5 - x**3 + 2
+    stats = SolverStats()
+    x, y = newton(f, 2, stats=stats)
+    assert stats.converged
+    assert stats.niter == len(x) - 1
+    assert stats.njev == stats.niter
+    assert stats.nsolve == stats.niter
+    # Each Jacobian of a scalar input takes three evaluations, plus one for each new guess and the initial guess
+    assert stats.nfev == 1 + 4*stats.niter
+    assert len(stats.residuals) == len(y)
+    assert stats.time_total >= stats.time_f
+
+def test_stats_instant_return():
+    def f(x):
+        return x*np.exp(x)
+    stats = SolverStats()
+    newton(f, 0, stats=stats)
+    assert stats.converged
+    assert stats.niter == 0
+    assert stats.nfev == 1
+
+def test_stats_no_solution():
+    def f(x):
+        return x**2 + np.array([1, 1, 1])
+    stats = SolverStats()
+    newton(f, np.array([3, 5, 3]), eps=1e-9, maxiter=5, stats=stats)
+    assert not stats.converged
+    assert stats.niter == 5
+
+def test_callback():
+    # Checks that the callback sees every new guess
+    def f(x):
+        return x**3
+    calls = []
+    def callback(i, x, y):
+        calls.append(i)
+    x, y = newton(f, np.array([3, 5, 3]), callback=callback)
+    assert calls == list(range(len(x) - 1))
+
+def test_stats_reuse():
+    # Counters accumulate across calls while the residuals only cover the latest call
+    def f(x):
+       return x**3 - 8
+    stats = SolverStats()
+    x1, y1 = newton(f, 3, stats=stats)
+    x2, y2 = newton(f, 5, stats=stats)
+    assert stats.niter == len(x1) + len(x2) - 2
+    assert len(stats.residuals) == len(y2)
+    assert stats.residuals[0] == np.linalg.norm(y2[0])
@@ -0,0 +1,59 @@
+import numpy as np
+from stats import SolverStats
+
+def test_wrap():
+    # Checks that wrapped calls are counted and keep their output
+    stats = SolverStats()
+    def f(x):
+        return 2*x
+    g = stats.wrap(f)
+    assert g(3) == 6
+    assert g(4) == 8
+    assert stats.nfev == 2
+    assert stats.time_f >= 0
+
+def test_timing():
+    stats = SolverStats()
+    f = stats.wrap(lambda x: x + 1)
+    stats.start()
+    f(1)
+    stats.stop(True)
+    assert stats.converged
+    assert stats.time_total >= stats.time_f
+    assert stats.overhead() >= 0
+
+def test_linear_rate():
+    # Residuals halving every iteration converge linearly with rate 1/2
+    stats = SolverStats()
+    stats.residuals = [1, 0.5, 0.25, 0.125]
+    assert np.linalg.norm(stats.convergence_rate() - 0.5) <= 1e-12
+    assert np.linalg.norm(stats.convergence_order() - 1) <= 1e-12
+
+def test_quadratic_order():
+    # Residuals squaring every iteration converge quadratically
+    stats = SolverStats()
+    stats.residuals = [1e-1, 1e-2, 1e-4, 1e-8]
+    assert np.linalg.norm(stats.convergence_order() - 2) <= 1e-9
+
+def test_as_dict():
+    stats = SolverStats()
+    d = stats.as_dict()
+    assert d['nfev'] == 0
+    assert np.isnan(d['residual'])
+    assert np.isnan(d['rate'])
+    assert np.isnan(d['order'])
+
+def test_print():
+    stats = SolverStats()
+    stats.residuals = [1, 0.5, 0.25]
+    print(stats)
+    pass
+
+def test_stop_keeps_converged():
+    # Stopping without a convergence flag only records the time
+    stats = SolverStats()
+    stats.start()
+    stats.stop(True)
+    stats.start()
+    stats.stop()
+    assert stats.converged